@@ -1,32 +1,63 @@
 # data cleaning
 import pandas as pd
 import numpy as np
+# fast file reading
+import pyarrow as pa
+from pyarrow import csv
+import pyarrow.dataset as ds
 # webscraping
-from bs4 import BeautifulSoup
+from lxml import html
 import requests
+# caching
+import functools
+import hashlib
+import os
 # text parsing
 import re
 
+# shared HTTP session (reuses connections across requests)
+SESSION = requests.Session()
+SESSION.headers.update({'Accept-Encoding': 'gzip'})
+SIC_CODES_CACHE = 'data/sic_codes.parquet'
+SUB_FILE = 'data/sub.txt'
+NUM_FILE = 'data/num.txt'
+CACHE_DIR = 'data/cache'
+
 
 def get_sic_codes():
     """
     Scrape the SIC (Industry) Codes from SEC's
     EDGAR website and return a dataframe with
     the mapping between SIC Code, granular-level
-    industry, and higher-level industry information
+    industry, and higher-level industry information.
+    The result is cached in memory and on disk
+    (data/sic_codes.parquet); delete the file to
+    re-scrape the website. Each call returns its
+    own copy, so callers may modify it freely.
     """
+    return _cached_sic_codes().copy()
+
+@functools.lru_cache(maxsize=1)
+def _cached_sic_codes():
+    try:
+        return pd.read_parquet(SIC_CODES_CACHE)
+    except FileNotFoundError:
+        pass
     # Scraping SIC Code (Industry) Data
     url = "https://www.sec.gov/info/edgar/siccodes.htm"
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text,"lxml")
+    res = SESSION.get(url)
+    doc = html.fromstring(res.content)
+    sic_table = doc.xpath("//*[contains(concat(' ', normalize-space(@class), ' '), ' sic ')]")[0]
     data = []
-    for tr in soup.find(class_="sic").find_all("tr"):
-        data.append([item.get_text(strip=True) for item in tr.find_all(["th","td"])])
+    for tr in sic_table.xpath(".//tr"):
+        data.append([item.text_content().strip() for item in tr.xpath("./th|./td")])
     # SIC Code data cleaning
     sic_codes = pd.DataFrame(data[1:])
     sic_codes.columns = data[0]
     sic_codes.Office = sic_codes.Office.apply(lambda x: x.replace("Office of", ""))
     sic_codes = sic_codes.astype({'SIC Code': int})
+    os.makedirs(os.path.dirname(SIC_CODES_CACHE), exist_ok=True)
+    sic_codes.to_parquet(SIC_CODES_CACHE)
     return sic_codes
 
 def load_company_data(year=2019, quarter='Q2'):
@@ -38,19 +69,24 @@ def load_company_data(year=2019, quarter='Q2'):
     with company name, submission unique id (adsh), 
     and filing details (form, fiscal year, period, etc.)
     """
-    # pulling in company submission data
-    sub = pd.read_csv('data/sub.txt', header = 0, sep='\t')
-    # filtering EDGAR submissions on quarterly financial statements
-    sub_10Q = sub[sub['form']=='10-Q']
     sub_columns = ['adsh', 'name', 'sic', 'countryba', 'form', 'fye', 'period', 'fy', 'fp', 'detail', 'instance']
-    # choosing submissions as of Q2 2019
-    sub_10Q_cols = sub_10Q.loc[(sub_10Q['fy'] == year) & (sub_10Q['fp'] == quarter), sub_columns]
-    sub_10Q_cols_filtered = sub_10Q_cols.loc[:, sub_columns].sort_values(by='name')
+    # pulling in company submission data, filtering on quarterly
+    # financial statements (10-Q) for the given year and quarter
+    # while reading so only the matching rows are materialized
+    # (column types are declared so none are guessed from the first block;
+    # sic, fye and fy can be blank, so they are floats as in pandas)
+    sub_types = {'adsh': pa.string(), 'name': pa.string(), 'sic': pa.float64(), 'countryba': pa.string(),
+                 'form': pa.string(), 'fye': pa.float64(), 'period': pa.int64(), 'fy': pa.float64(),
+                 'fp': pa.string(), 'detail': pa.int64(), 'instance': pa.string()}
+    sub_format = ds.CsvFileFormat(parse_options=csv.ParseOptions(delimiter='\t'),
+                                  convert_options=csv.ConvertOptions(column_types=sub_types,
+                                                                     strings_can_be_null=True))
+    sub = ds.dataset(SUB_FILE, format=sub_format)
+    sub_filter = (ds.field('form') == '10-Q') & (ds.field('fy') == year) & (ds.field('fp') == quarter)
+    sub_10Q_cols = sub.to_table(columns=sub_columns, filter=sub_filter).to_pandas()
+    sub_10Q_cols_filtered = sub_10Q_cols.sort_values(by='name', kind='stable')
     print(f"Number of Companies: {len(sub_10Q_cols_filtered)}")
-    sub_10Q_cols_filtered_dups_removed = sub_10Q_cols_filtered.\
-                                                                groupby('name').\
-                                                                filter(lambda x: len(x) >= 1).\
-                                                                drop_duplicates('name')
+    sub_10Q_cols_filtered_dups_removed = sub_10Q_cols_filtered.drop_duplicates('name')
     print(f"After Duplicates were Removed: {len(sub_10Q_cols_filtered_dups_removed)}")
     return sub_10Q_cols_filtered_dups_removed
 
@@ -64,25 +100,24 @@ def load_company_financials(df, sic_df, tags):
     Requires user to also supply names of the financial
     submission line items (tags) to be retained.
     Finally, transforms long dataset to wide dataset.
+    The filtered line items are cached as parquet files
+    in data/cache (delete them to re-read num.txt).
     """
-    # pulling in company financial data
-    num = pd.read_csv("data/num.txt", sep = "\t", header=0)
-    
-    # merging with company data to identify appropriate submissions
-    company_num = df.merge(num, how='left', on='adsh')
-    company_num = company_num.astype({'sic': int})
-    
-    # filtering on necessary tags, reporting period, etc.
-    company_num_filtered = company_num[(company_num['tag'].isin(tags)) & \
-                                            (company_num['ddate']==company_num['period']) & \
-                                            (company_num['qtrs'].isin([0, 1, 2])) & \
-                                            (company_num['coreg'].isna()) & \
-                                            (company_num['value'].isna() != True) & \
-                                            (company_num['uom'] == 'USD')]
-    company_num_filtered.sort_values(by=['name', 'tag', 'qtrs'], axis=0, inplace=True)
-    first_values = company_num_filtered.drop(columns=['qtrs', 'value', 'footnote']).drop_duplicates(inplace=False)
-    company_num_filtered_no_dups = company_num_filtered.loc[first_values.index]
-    df = company_num_filtered_no_dups.pivot(index = 'name', columns = 'tag', values = "value")
+    # filtered financials are cached on disk, keyed by the requested
+    # tags and submissions (and the num.txt modification time)
+    cache_key = hashlib.md5((str(sorted(tags)) + str(sorted(df['adsh'].unique())) +\
+                             str(os.path.getmtime(NUM_FILE))).encode()).hexdigest()[:12]
+    cache_path = os.path.join(CACHE_DIR, f'num_{cache_key}.parquet')
+    try:
+        company_num_filtered = pd.read_parquet(cache_path)
+    except FileNotFoundError:
+        company_num_filtered = filter_company_financials(df, tags)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        company_num_filtered.to_parquet(cache_path, compression='zstd')
+    # keeping the shortest reporting period (qtrs) per company and tag
+    company_num_filtered_no_dups = company_num_filtered.sort_values(by=['name', 'tag', 'qtrs'], axis=0).\
+                                                        drop_duplicates(subset=['name', 'tag'], keep='first')
+    df = pivot_values(company_num_filtered_no_dups, index='name', columns='tag', values='value')
     
 #     # merging with sic dataframe
 #     company_num_sic = company_num_filtered_no_dups.merge(sic_df, how='left', left_on='sic', right_on='SIC Code')
@@ -91,6 +126,65 @@ def load_company_financials(df, sic_df, tags):
     print(f"Final number of companies: {len(df)}")
     return df
 
+def filter_company_financials(df, tags):
+    """
+    Loading financials line items (num.txt) for the
+    submissions in df and keeping only the USD, non-
+    coregistrant values of the supplied tags that were
+    reported for the submission's period (qtrs 0-2).
+    Returns the filtered long dataset.
+    """
+    # pulling in company financial data, keeping only the USD rows
+    # of the requested submissions (adsh) and tags while reading
+    # (column types are declared so none are guessed from the first block)
+    num_columns = ['adsh', 'tag', 'version', 'coreg', 'ddate', 'qtrs', 'uom', 'value', 'footnote']
+    num_types = {'adsh': pa.string(),
+                 'tag': pa.dictionary(pa.int32(), pa.string()),
+                 'version': pa.string(),
+                 'coreg': pa.string(),
+                 'ddate': pa.int32(),
+                 'qtrs': pa.int32(),
+                 'uom': pa.dictionary(pa.int32(), pa.string()),
+                 'value': pa.float64(),
+                 'footnote': pa.string()}
+    num_format = ds.CsvFileFormat(parse_options=csv.ParseOptions(delimiter='\t'),
+                                  convert_options=csv.ConvertOptions(column_types=num_types,
+                                                                     strings_can_be_null=True))
+    num_filter = ds.field('adsh').isin(pa.array(df['adsh'].unique(), type=pa.string())) & \
+                 ds.field('tag').isin(pa.array(list(tags), type=pa.string())) & \
+                 (ds.field('uom') == 'USD')
+    num = ds.dataset(NUM_FILE, format=num_format).to_table(columns=num_columns, filter=num_filter).to_pandas()
+    
+    # merging with company data to identify appropriate submissions
+    company_num = df.merge(num, how='left', on='adsh')
+    company_num = company_num.astype({'sic': int})
+    
+    # filtering on reporting period, etc. (tags and uom were already
+    # filtered while reading; accumulated into a single boolean array)
+    mask = company_num['ddate'].to_numpy() == company_num['period'].to_numpy()
+    mask &= np.isin(company_num['qtrs'].to_numpy(), [0, 1, 2])
+    mask &= company_num['coreg'].isna().to_numpy()
+    mask &= company_num['value'].notna().to_numpy()
+    return company_num[mask].astype({'tag': str})
+
+def pivot_values(df, index, columns, values):
+    """
+    Long-to-wide transform equivalent to df.pivot(index,
+    columns, values), done by factorizing the index and
+    column labels and scattering the values straight into
+    a pre-allocated NumPy array (missing cells stay NaN).
+    """
+    row_codes, row_labels = pd.factorize(df[index], sort=True)
+    col_codes, col_labels = pd.factorize(df[columns], sort=True)
+    flat_codes = row_codes * len(col_labels) + col_codes
+    if len(np.unique(flat_codes)) != len(flat_codes):
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+    wide = np.full((len(row_labels), len(col_labels)), np.nan)
+    wide[row_codes, col_codes] = df[values].to_numpy(dtype=np.float64)
+    return pd.DataFrame(wide,
+                        index=pd.Index(row_labels, name=index),
+                        columns=pd.Index(col_labels, name=columns))
+
 def define_tags_by_type():
     """ 
     Returns "tags" (names of financial statement
@@ -150,7 +244,7 @@ def define_tags_by_type():
              'NetCashProvidedByUsedInInvestingActivities',
              'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents']
     marketable_sec = ['MarketableSecurities', 'MarketableSecuritiesCurrent',
-                      'MarketableSecuritiesNoncurrent', 'MarketableSecuritiesNoncurrent']
+                      'MarketableSecuritiesNoncurrent']
     accounts_payable = ['AccountsPayableCurrent', 'AccountsPayableAndAccruedLiabilitiesCurrent']
     st_debt = ['ShortTermBorrowings', 'ProceedsFromRepaymentsOfShortTermDebt',
                'LongTermDebtCurrent']
@@ -160,9 +254,12 @@ def define_tags_by_type():
                              'AccruedLiabilitiesAndOtherLiabilities']
     asset_liabilities = ['Assets', 'LiabilitiesAndStockholdersEquity','LiabilitiesNoncurrent',
                          'Liabilities', 'StockholdersEquity',]
-    all_tags = list(set(revenue + net_income + fixed_asset + current_asset + current_asset + current_liabilities +\
-                lt_debt + cogs + inventory + receivables + cash + marketable_sec + accounts_payable +\
-                st_debt + accured_liabilities + asset_liabilities))
+    all_tags = set()
+    for tag_type in (revenue, net_income, fixed_asset, current_asset, current_liabilities,
+                     lt_debt, cogs, inventory, receivables, cash, marketable_sec, accounts_payable,
+                     st_debt, accured_liabilities, asset_liabilities):
+        all_tags.update(tag_type)
+    all_tags = list(all_tags)
     
     return all_tags, revenue, net_income, fixed_asset, current_asset, current_liabilities,\
             lt_debt, cogs, inventory, receivables, cash, marketable_sec, accounts_payable,\
@@ -170,84 +267,70 @@ def define_tags_by_type():
 
 
 def fill_in_value_priority(df, tag_list, new_col_name):
-    df[new_col_name] = 0
-    for k in tag_list:
-        df[new_col_name] = df.apply(lambda x: x[k] if x[new_col_name] == 0 else x[new_col_name], axis=1)
-    df[new_col_name] = df[new_col_name].fillna(0)
+    # first non-zero, non-missing value (in tag priority order) wins,
+    # found for all rows at once on a (companies x tags) array
+    tag_values = df[tag_list].to_numpy(dtype=np.float64)
+    valid = (tag_values != 0) & ~np.isnan(tag_values)
+    first_valid = valid.argmax(axis=1)
+    rows = np.arange(len(tag_values))
+    df[new_col_name] = np.where(valid[rows, first_valid], tag_values[rows, first_valid], 0)
     return df
 
-def calc_ROE(df):
-    df['ROE_'] = df['NetIncome_'].div(df['Equity_'])
-    df = divide_by_zero_fix(df, 'ROE_', default_value=0)
-    return df
-
-def calc_ROA(df):
-    df['ROA_'] = df['NetIncome_'].div(df['Assets_'])
-    df = divide_by_zero_fix(df, 'ROA_', default_value=0)
-    return df
-
-def calc_profit_margin(df):
-    df['ProfitMargin_'] = df['NetIncome_'].div(df['Revenue_'])
-    df = divide_by_zero_fix(df, 'ProfitMargin_', default_value=0)
-    return df
-
-def calc_equity_multiplier(df):
-    df['EquityMultiplier_'] = df['Assets_'].div(df['Equity_'])
-    df = divide_by_zero_fix(df, 'EquityMultiplier_', default_value=0)
-    return df
-
-
-def calc_fixed_assets_to_net_worth(df):
-    df['FixedAssetsToNetWorth_'] = (df['Assets_'] - df['CurrentAssets_']) / df['Equity_']
-    df = divide_by_zero_fix(df, 'FixedAssetsToNetWorth_', default_value=0)
-    return df
-
-def calc_debt_to_net_worth(df):
-    df['DebtToNetWorth_'] = (df['LTDebt_'] + df['STDebt_']) / df['Equity_']
-    df = divide_by_zero_fix(df, 'DebtToNetWorth_', default_value=0)
-    return df
-
-def calc_asset_turnover(df):
-    df['AssetTurnover_'] = df['Revenue_'].div(df['Assets_'])
-    df = divide_by_zero_fix(df, 'AssetTurnover_', default_value=0)
-    return df
-
-def calc_inventory_turnover(df):
-    df['InventoryTurnover_'] = df['COGS_'].div(df['Inventory_'])
-    df = divide_by_zero_fix(df, 'InventoryTurnover_', default_value=0)
-    return df
-
-def calc_days_receivables(df):
-    df['DaysReceivables_'] = 365/(df['Revenue_'].div(df['AccountsReceivable_']))
-    df = divide_by_zero_fix(df, 'DaysReceivables_', default_value=0)
-    return df
-
-def calc_quick_ratio(df):
-    df['QRnumerator_'] = df.apply(lambda x: x.Cash_ + x.MarketableSec_ + x.AccountsReceivable_,
-                                       axis=1)
-    df['QRdenomerator_'] = df.apply(lambda x: x.STDebt_ + x.AccountsPayable_ + x.AccruedLiabilities_,
-                                       axis=1)
-    df['QuickRatio_'] = 365/(df['QRnumerator_'].div(df['QRdenomerator_']))
-    df = divide_by_zero_fix(df, 'QuickRatio_', default_value=0)
+def calc_financial_ratios(df):
+    """
+    Calculates all financial ratios (ROE, ROA, Profit Margin,
+    Equity Multiplier, Fixed Assets to Net Worth, Debt to
+    Net Worth, Asset Turnover, Inventory Turnover, Days
+    Receivables, and Quick Ratio) in a single pass, reading
+    each input column once. Ratios with a zero denominator
+    are set to 0.
+    """
+    net_income, assets, equity, revenue, current_assets, lt_debt, st_debt, cogs, inventory,\
+    receivables, cash, marketable_sec, accounts_payable, accrued_liabilities = \
+        (df[col].to_numpy(dtype=np.float64) for col in ('NetIncome_', 'Assets_', 'Equity_', 'Revenue_',
+                                                        'CurrentAssets_', 'LTDebt_', 'STDebt_', 'COGS_',
+                                                        'Inventory_', 'AccountsReceivable_', 'Cash_',
+                                                        'MarketableSec_', 'AccountsPayable_',
+                                                        'AccruedLiabilities_'))
+    qr_numerator = cash + marketable_sec + receivables
+    qr_denominator = st_debt + accounts_payable + accrued_liabilities
+    ratios = np.column_stack([safe_divide(net_income, equity),
+                              safe_divide(net_income, assets),
+                              safe_divide(net_income, revenue),
+                              safe_divide(assets, equity),
+                              safe_divide(assets - current_assets, equity),
+                              safe_divide(lt_debt + st_debt, equity),
+                              safe_divide(revenue, assets),
+                              safe_divide(cogs, inventory),
+                              safe_divide(365, safe_divide(revenue, receivables)),
+                              safe_divide(365, safe_divide(qr_numerator, qr_denominator))])
+    df['QRnumerator_'] = qr_numerator
+    df['QRdenomerator_'] = qr_denominator
+    df[['ROE_', 'ROA_', 'ProfitMargin_', 'EquityMultiplier_', 'FixedAssetsToNetWorth_',
+        'DebtToNetWorth_', 'AssetTurnover_', 'InventoryTurnover_', 'DaysReceivables_',
+        'QuickRatio_']] = ratios
     return df
 
-def divide_by_zero_fix(df, col_name, default_value=0):
-    df.loc[~np.isfinite(df[col_name]), col_name] = default_value
-    return df
+def safe_divide(numerator, denominator, default_value=0):
+    """
+    Divides numerator by denominator element-wise, skipping
+    (and filling with default_value) the entries where the
+    denominator is zero instead of dividing and masking out
+    the resulting inf/nan values afterwards.
+    """
+    out = np.full(np.broadcast(numerator, denominator).shape, default_value, dtype=np.float64)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
 
 def calc_ratios(df, new_col_names):
-    df['Assets_'] = df['Assets'].map(lambda x: 0 if x != x else x)
-    df['Liabilities_'] = df.apply(lambda x: x.Liabilities if x.Liabilities == x.Liabilities else\
-                                            x.LiabilitiesAndStockholdersEquity - x.StockholdersEquity,
-                                            axis=1)
-    df['Liabilities_'] = df.apply(lambda x: x.Liabilities_ if x.Liabilities_ == x.Liabilities_ else\
-                                            0 if (x.LiabilitiesAndStockholdersEquity - x.Assets_) == 0 else\
-                                            x.Liabilities_,
-                                            axis=1)
+    df['Assets_'] = df['Assets'].fillna(0)
+    liabilities = df['Liabilities'].where(df['Liabilities'].notna(),
+                                          df['LiabilitiesAndStockholdersEquity'] - df['StockholdersEquity'])
+    liabilities = liabilities.where(liabilities.notna() | \
+                                    ((df['LiabilitiesAndStockholdersEquity'] - df['Assets_']) != 0), 0)
+    df['Liabilities_'] = liabilities
     df.dropna(subset=['Liabilities_'], axis=0, inplace=True)
-    df['Equity_'] = df.apply(lambda x: x.StockholdersEquity if x.StockholdersEquity == x.StockholdersEquity else\
-                                       x.Assets_ - x.Liabilities_,
-                                       axis=1)
+    df['Equity_'] = df['StockholdersEquity'].where(df['StockholdersEquity'].notna(),
+                                                   df['Assets_'] - df['Liabilities_'])
     df = df.fillna(value=0)
 #     new_col_names = [('NetIncome_', net_income_tags),
 #                      ('Revenue_', revenue_tags),
@@ -265,24 +348,62 @@ def calc_ratios(df, new_col_names):
 #                      ('FixedAssets_', fixed_asset_tags)]
     for item in new_col_names:
         df = fill_in_value_priority(df, item[1], item[0])
-    df = calc_ROE(df)
-    df = calc_ROA(df)
-    df = calc_profit_margin(df)
-    df = calc_equity_multiplier(df)
-    df = calc_fixed_assets_to_net_worth(df)
-    df = calc_debt_to_net_worth(df)
-    df = calc_asset_turnover(df)
-    df = calc_inventory_turnover(df)
-    df = calc_days_receivables(df)
-    df = calc_quick_ratio(df)
+    df = calc_financial_ratios(df)
     return df
 
 def log_features(df):
     cols_to_look_at = ['Assets_', 'Liabilities_', 'Equity_', 'ROE_', 'ROA_', 'ProfitMargin_',
                                 'EquityMultiplier_', 'FixedAssetsToNetWorth_', 'DebtToNetWorth_',
                                 'AssetTurnover_', 'InventoryTurnover_', 'DaysReceivables_', 'QuickRatio_']
-    df_new = df[cols_to_look_at].copy(deep=True)
     c = 0.01
-    for col in cols_to_look_at:
-        df_new.loc[col] = df_new[col].apply(lambda x: np.log(c + x))
-    return df_new.fillna(0)
\ No newline at end of file
+    # log(c + x) over all columns at once on a float copy of the ratios
+    df_new = df[cols_to_look_at]
+    values = df_new.to_numpy(dtype=np.float64, copy=True)
+    np.add(values, c, out=values)
+    np.log(values, out=values)
+    df_new = pd.DataFrame(values, index=df_new.index, columns=df_new.columns)
+    return df_new.fillna(0)
+
+def build_ratios(year=2019, quarter='Q2'):
+    """
+    Runs the full pipeline (load_company_data ->
+    load_company_financials -> calc_ratios -> log_features)
+    for the given year (default = 2019) and quarter
+    (default = Q2) using the tags from define_tags_by_type.
+    Returns the logged financial ratios by company.
+    The result is cached as a parquet file in data/cache
+    (delete it to re-run the pipeline).
+    """
+    tag_list, revenue_tags, net_income_tags, fixed_asset_tags, current_asset_tags,\
+    current_liabilities_tags, lt_debt_tags, cogs_tags, inventory_tags, receivables_tags,\
+    cash_tags, marketable_sec_tags, accounts_payable_tags, st_debt_tags, accured_liabilities_tags,\
+    asset_liabilities_tags = define_tags_by_type()
+    cache_key = hashlib.md5((str(sorted(tag_list)) + str(os.path.getmtime(SUB_FILE)) +\
+                             str(os.path.getmtime(NUM_FILE))).encode()).hexdigest()[:12]
+    cache_path = os.path.join(CACHE_DIR, f'ratios_{year}_{quarter}_{cache_key}.parquet')
+    try:
+        return pd.read_parquet(cache_path)
+    except FileNotFoundError:
+        pass
+    new_col_names = [('NetIncome_', net_income_tags),
+                     ('Revenue_', revenue_tags),
+                     ('CurrentAssets_', current_asset_tags),
+                     ('CurrentLiabilities_', current_liabilities_tags),
+                     ('LTDebt_', lt_debt_tags),
+                     ('STDebt_', st_debt_tags),
+                     ('COGS_', cogs_tags),
+                     ('Inventory_', inventory_tags),
+                     ('Cash_', cash_tags),
+                     ('AccountsReceivable_', receivables_tags),
+                     ('MarketableSec_', marketable_sec_tags),
+                     ('AccountsPayable_', accounts_payable_tags),
+                     ('AccruedLiabilities_', accured_liabilities_tags),
+                     ('FixedAssets_', fixed_asset_tags)]
+    company_df = load_company_data(year, quarter)
+    # sic codes are only needed for the (commented out) industry merge
+    df = load_company_financials(company_df, None, tag_list)
+    df = calc_ratios(df, new_col_names)
+    df_logged = log_features(df)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df_logged.to_parquet(cache_path, compression='zstd')
+    return df_logged